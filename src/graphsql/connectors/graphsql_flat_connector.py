@@ -1,5 +1,10 @@
 import os
+import hashlib
+import logging
+import threading
 import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 
 from graphsql.introspection.introspection import GraphQLIntrospection
 from graphsql.introspection.schema_parser import SchemaParser
@@ -7,6 +12,13 @@ from graphsql.translators.sql_parser import SQLParser
 from graphsql.datafetch.data_fetch import DataFetch
 from graphsql.translators.json_to_tabular import JSONToTabular
 
+logger = logging.getLogger(__name__)
+
+# Process-wide cache of endpoints whose schema/mappings/relations files have
+# already been ensured, so repeated connector construction skips introspection.
+_ensured_endpoints = set()
+_ensured_endpoints_lock = threading.Lock()
+
 class GraphSQLFlatConnector:
     """
     Connects all components together:
@@ -16,6 +28,10 @@ class GraphSQLFlatConnector:
     - Converts the data into a tabular format for visualization.
     """
 
+    # Data directories already created this process, so repeated connector
+    # construction skips the mkdir syscall.
+    _dirs_ensured = set()
+
     def __init__(self, endpoint, depth_cutoff=2, output_format="parquet"):
         self.endpoint = endpoint.rstrip('/')
         self.depth_cutoff = depth_cutoff
@@ -24,14 +40,20 @@ class GraphSQLFlatConnector:
         self.data_dir = "data"
         self.schema_path = ""
         self.schema_filename = ""
-        os.makedirs(self.data_dir, exist_ok=True)
+        if self.data_dir not in GraphSQLFlatConnector._dirs_ensured:
+            os.makedirs(self.data_dir, exist_ok=True)
+            GraphSQLFlatConnector._dirs_ensured.add(self.data_dir)
         
         self.introspector = GraphQLIntrospection(self.endpoint)
-        self._ensure_schema()
-        self.schema_hash = self._get_schema_hash()
-        self.mappings_path = f"{self.schema_dir}/mappings_{self.schema_hash}.json"
-        self.relations_path = f"{self.schema_dir}/relations_{self.schema_hash}.json"
-        self._ensure_mappings()
+        with _ensured_endpoints_lock:
+            cached = self.endpoint in _ensured_endpoints
+            self._ensure_schema()
+            self.schema_hash = self._get_schema_hash()
+            self.mappings_path = f"{self.schema_dir}/mappings_{self.schema_hash}.json"
+            self.relations_path = f"{self.schema_dir}/relations_{self.schema_hash}.json"
+            if not cached:
+                self._ensure_mappings()
+                _ensured_endpoints.add(self.endpoint)
         
         self.sql_parser = SQLParser(mappings_path=self.mappings_path, relations_path=self.relations_path)
         self.data_fetcher = DataFetch(self.endpoint)
@@ -57,13 +79,48 @@ class GraphSQLFlatConnector:
             schema_parser.parse()
         if not os.path.exists(self.mappings_path) or not os.path.exists(self.relations_path):
             raise FileNotFoundError("Mappings or relations JSON not found. Run SchemaParser first.")
-        print("✅ Schema, mappings, and relations confirmed.")
+        logger.debug("Schema, mappings, and relations confirmed.")
+
+    def _try_arrow_fast_path(self, graphql_query):
+        """
+        Fetches a single flat query straight into a pyarrow.Table and writes
+        the output file with pyarrow's native writers, skipping the
+        JSON-on-disk round trip through JSONToTabular and the pandas
+        DataFrame materialization. Returns the output path, or None when the
+        query set or response shape does not qualify.
+        """
+        if isinstance(graphql_query, dict):
+            queries = graphql_query.get("graphql_queries", [])
+        else:
+            queries = list(graphql_query)
+        if len(queries) != 1:
+            return None
+
+        table = self.data_fetcher.fetch_arrow(queries[0])
+        if table is None:
+            return None
+
+        output_dir = os.path.join(self.data_dir, "tabular")
+        os.makedirs(output_dir, exist_ok=True)
+        query_hash = hashlib.blake2b(queries[0].encode(), digest_size=16).hexdigest()
+        output_path = os.path.join(output_dir, f"output_{query_hash}.{self.output_format}")
+        if self.output_format == "parquet":
+            pq.write_table(table, output_path, compression="zstd")
+        else:
+            pacsv.write_csv(table, output_path)
+        return output_path
 
     def execute_sql(self, sql_query):
         """Executes SQL query by translating and fetching data."""
-        print(f"🔍 Processing SQL Query: {sql_query}")
+        logger.debug("Processing SQL Query: %s", sql_query)
         graphql_query = self.sql_parser.convert_to_graphql(sql_query)
-        print(" Query: ", graphql_query)
+        logger.debug("Query: %s", graphql_query)
+
+        if self.output_format in ("parquet", "csv"):
+            arrow_path = self._try_arrow_fast_path(graphql_query)
+            if arrow_path:
+                return arrow_path
+
         file_path = self.data_fetcher.fetch_data(graphql_query)
         
         if not file_path:
@@ -86,5 +143,5 @@ if __name__ == "__main__":
     
     import pandas as pd
     output_path = connector.execute_sql(test_sql)
-    df = pd.read_parquet(output_path, engine='pyarrow')
+    df = pd.read_parquet(output_path, engine='pyarrow', dtype_backend='pyarrow')
     print(df.head())
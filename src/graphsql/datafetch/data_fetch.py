@@ -1,62 +1,437 @@
+import asyncio
 import json
 import hashlib
+import logging
 import os
+import re
+import time
 import requests
 
+from requests.adapters import HTTPAdapter, Retry
+
+import pyarrow as pa
+
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp  # async HTTP client for the asyncio fetch path
+except ImportError:
+    aiohttp = None
+
+try:
+    import simdjson  # SIMD-accelerated JSON parser (pysimdjson)
+except ImportError:
+    simdjson = None
+
+try:
+    import orjson  # C-native JSON, much faster than stdlib
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash  # SIMD-accelerated non-cryptographic hash
+
+    def _hash_query(data):
+        return xxhash.xxh3_128(data).hexdigest()
+except ImportError:
+    def _hash_query(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 class DataFetch:
-    def __init__(self, endpoint, output_dir="data/", auth_token=None, additional_headers=[]):
+
+    # Per-endpoint record of whether the server accepts batched (array) payloads,
+    # learned from the first multi-query call so we only probe once per process.
+    _batch_support = {}
+
+    # Output directories already created this process, so repeated construction
+    # skips the mkdir syscall.
+    _dirs_ensured = set()
+
+    # The single-root-field shape emitted by SQLParser, e.g.
+    # "query rockets { rockets(...) { id name } }" — the only shape the
+    # alias-merging fallback knows how to combine and split safely.
+    _SINGLE_ROOT_QUERY = re.compile(r"^\s*(?:query\s+\w*\s*)?\{\s*(?P<field>\w+)(?P<rest>.*)\}\s*$", re.DOTALL)
+
+    def __init__(self, endpoint, output_dir="data/", auth_token=None, additional_headers=[], ttl=3600, retries=3):
         self.endpoint = endpoint
         self.output_dir = output_dir
         self.auth_token = auth_token
         self.additional_headers = additional_headers
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.ttl = ttl
+        self.retries = retries
+        self._session = requests.Session()
+        # Retries with exponential backoff are handled at the HTTP layer by
+        # urllib3 rather than with Python-level sleeps in the worker threads.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST"],
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({"Content-Type": "application/json"})
+
+        # Auth and extra headers never change after construction, so build the
+        # per-request header dict once instead of on every request.
+        self._headers = {}
+        if self.auth_token:
+            self._headers["Authorization"] = f"{self.auth_token}"
+        if self.additional_headers:
+            for key, value in self.additional_headers.items():
+                self._headers[key] = value
+
+        if self.output_dir not in DataFetch._dirs_ensured:
+            os.makedirs(self.output_dir, exist_ok=True)
+            DataFetch._dirs_ensured.add(self.output_dir)
 
     def _generate_filename(self, query):
         """Generate a unique filename based on query hash."""
-        query_hash = hashlib.md5(query.encode()).hexdigest()
+        query_hash = _hash_query(query.encode("utf-8", "ignore"))
         return os.path.join(self.output_dir, f"response_{query_hash}.json")
 
     def _save_json(self, filepath, data):
-        """Save JSON response to file."""
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        """Save JSON response to file (compact, no indentation)."""
+        if orjson is not None:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(data))
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(data, f)
 
-    def fetch_data(self, queries):
+    def _parse_response(self, response):
+        """Parse a JSON response body, preferring simdjson, then orjson."""
+        if simdjson is not None:
+            return simdjson.loads(response.content)
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def _load_json(self, filepath):
+        """Parse a stored response file, preferring simdjson, then orjson."""
+        with open(filepath, "rb") as f:
+            data = f.read()
+        if simdjson is not None:
+            return simdjson.loads(data)
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def _cached_filepath(self, query):
+        """
+        Returns the stored response path for a query when a fresh copy already
+        exists on disk (younger than the configured TTL), else None.
+        """
+        filepath = self._generate_filename(query)
+        if os.path.exists(filepath) and (time.time() - os.path.getmtime(filepath)) < self.ttl:
+            return filepath
+        return None
+
+    def _fetch_one(self, query):
+        """Executes a single GraphQL query and stores the JSON response."""
+        payload = {"query": query}
+        headers = self._headers
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request: Endpoint: %s Headers: %s Payload: %s", self.endpoint, headers, payload)
+        response = self._session.post(
+            self.endpoint,
+            json=payload,
+            headers=headers,
+            stream=True,
+        )
+        if response.status_code == 200:
+            # The body is stored verbatim, so stream it straight to disk in
+            # chunks instead of materializing (and re-serializing) the whole
+            # response as a Python dict.
+            filepath = self._generate_filename(query)
+            with open(filepath, "wb") as f:
+                for chunk in response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+            return filepath
+
+        logger.warning("Query failed: %s\n%s", response.status_code, response.text)
+        return None
+
+    def fetch_arrow(self, query):
+        """
+        Executes a single GraphQL query and returns the response as a
+        pyarrow.Table, skipping the JSON-on-disk intermediate entirely.
+
+        Only applies to the common "flat list of records" response shape
+        (a single top-level field holding a list of dicts). Returns None on
+        request failure or when the response does not match that shape, so
+        the caller can fall back to fetch_data + JSONToTabular. Shares the
+        TTL response cache with the other fetch paths: a fresh stored
+        response is parsed from disk, and a network fetch writes its body to
+        the cache file.
+        """
+        filepath = self._cached_filepath(query)
+        if filepath:
+            result = self._load_json(filepath)
+        else:
+            response = self._session.post(
+                self.endpoint,
+                json={"query": query},
+                headers=self._headers,
+            )
+            if response.status_code != 200:
+                logger.warning("Query failed: %s\n%s", response.status_code, response.text)
+                return None
+
+            with open(self._generate_filename(query), "wb") as f:
+                f.write(response.content)
+            result = self._parse_response(response)
+        data = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(data, dict) or len(data) != 1:
+            return None
+
+        records = next(iter(data.values()))
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return None
+
+        return pa.Table.from_pylist(records)
+
+    def _fetch_batch(self, queries):
+        """
+        Sends all queries in a single HTTP POST using the GraphQL-over-HTTP
+        batching convention (an array of {"query": ...} payloads).
+
+        Returns the parsed response dicts on success, or None when the server
+        does not support batched payloads, so the caller can fall back to
+        per-query requests.
+        """
+        payload = [{"query": query} for query in queries]
+        headers = self._headers
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Batch Request: Endpoint: %s Headers: %s Queries: %s", self.endpoint, headers, len(queries))
+        response = self._session.post(
+            self.endpoint,
+            json=payload,
+            headers=headers,
+        )
+        if response.status_code != 200:
+            return None
+
+        results = self._parse_response(response)
+        if not isinstance(results, list) or len(results) != len(queries):
+            return None
+        return results
+
+    def _save_all(self, queries, results):
+        """
+        Writes each parsed response to its hashed cache file. Writes target
+        disjoint files, so they fan out to worker threads and overlap
+        serialization with disk I/O instead of running serially.
+        """
+        filepaths = [self._generate_filename(query) for query in queries]
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as writer:
+            list(writer.map(self._save_json, filepaths, results))
+        return filepaths
+
+    async def fetch_data_async(self, queries, concurrency=8):
         """
-        Executes a list of GraphQL queries sequentially.
+        Async variant of fetch_data for callers already running an event loop.
+
+        Dispatches the queries over a shared aiohttp session bounded by a
+        semaphore, writing each response body straight to its hashed file.
+        Cached responses are served from disk as in fetch_data. When aiohttp
+        is not installed, the threaded fetch_data runs in an executor instead.
 
         Args:
             queries: list of graphql queries
+            concurrency: maximum number of in-flight requests
 
         Returns:
-            list: Filepaths of the stored JSON responses.
+            list: Filepaths of the stored JSON responses, in query order.
         """
-        filepaths = []
-        for query in queries:
-            payload = {"query": query}
-            headers = {"Content-Type": "application/json"}
+        queries = list(queries)
+        if not queries:
+            return []
 
-            if self.auth_token:
-                headers["Authorization"] = f"{self.auth_token}"
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.fetch_data, queries)
 
-            if self.additional_headers:
-                for key, value in getattr(self, "additional_headers", {}).items():
-                    headers[key] = value
+        semaphore = asyncio.Semaphore(concurrency)
+        headers = {"Content-Type": "application/json", **self._headers}
 
-            print("Request: ", "Endpoint: ", self.endpoint, "Headers: ", headers, "Payload: ", payload)
-            response = requests.post(
-                self.endpoint,
-                json=payload,
-                headers=headers,
-            )
-            if response.status_code == 200:
-                result = response.json()
+        async with aiohttp.ClientSession(headers=headers) as session:
+
+            async def fetch(query):
+                filepath = self._cached_filepath(query)
+                if filepath:
+                    return filepath
+                async with semaphore:
+                    async with session.post(self.endpoint, json={"query": query}) as response:
+                        if response.status != 200:
+                            logger.warning("Query failed: %s\n%s", response.status, await response.text())
+                            return None
+                        body = await response.read()
                 filepath = self._generate_filename(query)
-                self._save_json(filepath, result)
-                filepaths.append(filepath)
+                with open(filepath, "wb") as f:
+                    f.write(body)
+                return filepath
+
+            return list(await asyncio.gather(*(fetch(query) for query in queries)))
+
+    def _fetch_aliased(self, queries):
+        """
+        Merges simple single-root-field queries into one query with aliased
+        root fields (q0:, q1:, ...), POSTs it once, then splits the response
+        back into per-query files with the original field names restored.
+
+        Used when the server rejects array payloads. Returns the per-query
+        response dicts, or None when any query does not match the mergeable
+        shape or the request fails, so the caller can fall back to concurrent
+        per-query requests.
+        """
+        parts = []
+        fields = []
+        for i, query in enumerate(queries):
+            match = self._SINGLE_ROOT_QUERY.match(query)
+            if not match:
+                return None
+            parts.append(f"q{i}: {match.group('field')}{match.group('rest')}")
+            fields.append(match.group("field"))
+
+        merged = "query { " + " ".join(parts) + " }"
+        response = self._session.post(
+            self.endpoint,
+            json={"query": merged},
+            headers=self._headers,
+        )
+        if response.status_code != 200:
+            return None
+
+        result = self._parse_response(response)
+        data = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(data, dict):
+            return None
+
+        results = []
+        for i, field in enumerate(fields):
+            alias = f"q{i}"
+            if alias not in data:
+                return None
+            results.append({"data": {field: data[alias]}})
+        return results
+
+    def fetch_data(self, queries):
+        """
+        Executes a list of GraphQL queries concurrently.
+
+        Duplicate queries are collapsed and fetched once; every occurrence in
+        the input maps to the same response file in the output. Queries whose
+        hashed response file already exists on disk (and is younger than `ttl`
+        seconds) are served from that file without touching the network.
+        Remaining queries are first attempted as one batched HTTP POST, which
+        removes the per-query connection and header overhead. Endpoints that
+        reject array payloads are remembered and subsequently served by
+        concurrent per-query requests, so total latency approaches the slowest
+        round-trip instead of the sum of all of them.
+
+        Args:
+            queries: list of graphql queries
+
+        Returns:
+            list: Filepaths of the stored JSON responses, in query order.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        filepath_by_query = {query: self._cached_filepath(query) for query in queries}
+        pending = [query for query, filepath in filepath_by_query.items() if filepath is None]
+
+        if pending:
+            results = self._fetch_merged(pending)
+            if results is not None:
+                fetched = self._save_all(pending, results)
+            elif len(pending) == 1:
+                fetched = [self._fetch_one(pending[0])]
             else:
-                print(f"Query failed: {response.status_code}\n{response.text}")
-                filepaths.append(None)
+                with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+                    fetched = list(executor.map(self._fetch_one, pending))
+            filepath_by_query.update(zip(pending, fetched))
+
+        filepaths = [filepath_by_query[query] for query in queries]
 
-        print("Fetched Data Files: ", filepaths)
+        logger.debug("Fetched Data Files: %s", filepaths)
         return filepaths
+
+    def _fetch_merged(self, queries):
+        """
+        Fetches several queries in one round-trip when the server allows it:
+        a batched array POST first, then the alias-merging fallback. Returns
+        the parsed response dicts, or None when neither applies.
+        """
+        results = None
+        if len(queries) > 1 and DataFetch._batch_support.get(self.endpoint, True):
+            results = self._fetch_batch(queries)
+            DataFetch._batch_support[self.endpoint] = results is not None
+        if results is None and len(queries) > 1:
+            results = self._fetch_aliased(queries)
+        return results
+
+    def _fetch_one_json(self, query):
+        """
+        Executes a single GraphQL query, returning the parsed response and
+        writing it to the cache file as a side effect.
+        """
+        response = self._session.post(
+            self.endpoint,
+            json={"query": query},
+            headers=self._headers,
+        )
+        if response.status_code != 200:
+            logger.warning("Query failed: %s\n%s", response.status_code, response.text)
+            return None
+
+        filepath = self._generate_filename(query)
+        with open(filepath, "wb") as f:
+            f.write(response.content)
+        return self._parse_response(response)
+
+    def fetch_json(self, queries):
+        """
+        Executes a list of GraphQL queries and returns the parsed response
+        dicts, in query order.
+
+        Same dedupe, TTL cache, batching, and fallback behaviour as
+        fetch_data, but responses stay in memory on their way to the caller —
+        the write-then-reread round trip through the response files is gone
+        from the hot path, and disk is touched only to maintain the cache.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        result_by_query = {}
+        pending = []
+        for query in dict.fromkeys(queries):
+            filepath = self._cached_filepath(query)
+            if filepath:
+                result_by_query[query] = self._load_json(filepath)
+            else:
+                pending.append(query)
+
+        if pending:
+            results = self._fetch_merged(pending)
+            if results is not None:
+                self._save_all(pending, results)
+            elif len(pending) == 1:
+                results = [self._fetch_one_json(pending[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(32, len(pending))) as executor:
+                    results = list(executor.map(self._fetch_one_json, pending))
+            result_by_query.update(zip(pending, results))
+
+        return [result_by_query[query] for query in queries]
@@ -1,18 +1,49 @@
 import os
-import hashlib
+import threading
 
-from graphsql.introspection.introspection import GraphQLIntrospection
+from graphsql.introspection.introspection import GraphQLIntrospection, endpoint_hash
 from graphsql.introspection.schema_parser import SchemaParser
+from graphsql.translators.sql_parser import SQLParser
 
-from graphsql.dbapi.cursor import GraphSQLCursor 
-
-from urllib.parse import urlparse
+from graphsql.dbapi.cursor import GraphSQLCursor
 
 class Error(Exception):
     """Generic DBAPI Error."""
     pass
 
 paramstyle = "named"
+
+# Process-wide cache of endpoint -> (schema_path, mappings_path, relations_path)
+# so repeated connections skip introspection and schema parsing entirely.
+_schema_cache = {}
+_schema_cache_lock = threading.Lock()
+
+
+def _ensure_schema_files(endpoint):
+    """
+    Fetches and parses the schema for an endpoint once per process.
+    Returns (schema_path, mappings_path, relations_path), revalidating that
+    the cached files still exist on disk before reusing them.
+    """
+    with _schema_cache_lock:
+        cached = _schema_cache.get(endpoint)
+        if cached and all(os.path.exists(path) for path in cached):
+            return cached
+
+        introspection = GraphQLIntrospection(endpoint)
+        schema_path = introspection.load_schema()
+
+        hash_value = endpoint_hash(endpoint)
+        mappings_path = f"schemas/mappings_{hash_value}.json"
+        relations_path = f"schemas/relations_{hash_value}.json"
+        if not os.path.exists(mappings_path) or not os.path.exists(relations_path):
+            schema_parser = SchemaParser(schema_path)
+            schema_parser.parse()
+
+        _schema_cache[endpoint] = (schema_path, mappings_path, relations_path)
+        return _schema_cache[endpoint]
+
+
 class GraphSQLConnection:
     """DBAPI-compliant connection for GraphSQL."""
 
@@ -27,27 +58,25 @@ class GraphSQLConnection:
         self.headers = headers or {}
         self._closed = False
 
-        introspection = GraphQLIntrospection(endpoint)
-        self.schema_path = introspection.load_schema()
-
-        parsed_url = urlparse(self.endpoint)
-        if parsed_url.scheme in ["http", "https", "graphsql"]:
-            cleaned_endpoint = parsed_url.netloc
-        else:
-            cleaned_endpoint = self.endpoint
-        
-        endpoint_hash = hashlib.md5(cleaned_endpoint.encode()).hexdigest()[:10]
-        mappings_path = f"schemas/mappings_{endpoint_hash}.json"
-        relations_path = f"schemas/relations_{endpoint_hash}.json"
-        if not os.path.exists(mappings_path) or not os.path.exists(relations_path):
-            schema_parser = SchemaParser(self.schema_path)
-            schema_parser.parse()
+        self.schema_path, self.mappings_path, self.relations_path = _ensure_schema_files(endpoint)
+        self._sql_parser = None
 
     def cursor(self):
         """Returns a new cursor object for executing queries."""
         if self._closed:
             raise Exception("Connection is closed.")
-        return GraphSQLCursor(self.endpoint, self.headers)
+        if self._sql_parser is None:
+            self._sql_parser = SQLParser(
+                mappings_path=self.mappings_path,
+                relations_path=self.relations_path,
+            )
+        return GraphSQLCursor(
+            self.endpoint,
+            self.headers,
+            mappings_path=self.mappings_path,
+            relations_path=self.relations_path,
+            sql_parser=self._sql_parser,
+        )
 
     def close(self):
         """Closes the connection."""
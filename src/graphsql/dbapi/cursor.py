@@ -3,14 +3,49 @@ from graphsql.datafetch.data_fetch import DataFetch
 from graphsql.translators.json_to_tabular import JSONToTabular
 from graphsql.translators.sql_post_processor import SQLPostProcessor
 from graphsql.dbapi.duckdb import DuckDBSingleton
+from graphsql.introspection.introspection import endpoint_hash
 
+import collections
+import functools
 import hashlib
-from urllib.parse import urlparse
+import json
+import logging
+import os
+import threading
+import time
+
+import pyarrow as pa
+
+@functools.lru_cache(maxsize=16)
+def _load_mapping(path, mtime):
+    """
+    Loads a mappings/relations JSON file, memoized on (path, mtime) so the
+    same read-only file is parsed once per process instead of per statement.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+logger = logging.getLogger(__name__)
+
 
 class GraphSQLCursor:
     """DBAPI-compliant cursor for executing SQL queries via GraphQL."""
 
-    def __init__(self, endpoint: str, headers: dict = None, output_format="duckdb"):
+    # Statement results already materialized as DuckDB tables, keyed by a hash
+    # of (endpoint, statement). BI tools resubmit the same statement constantly
+    # (autocomplete, refresh); a hit here skips the GraphQL round-trip and the
+    # JSON flattening entirely and re-runs only the local post-processing.
+    # Each statement owns a table named after its cache key, so entries can
+    # never alias another statement's rows; the lock covers the shared
+    # OrderedDict, since BI pools execute on several threads at once.
+    _table_cache = collections.OrderedDict()
+    _table_cache_size = 128
+    _table_cache_ttl = 3600
+    _table_cache_lock = threading.Lock()
+
+    def __init__(self, endpoint: str, headers: dict = None, output_format="duckdb",
+                 mappings_path: str = None, relations_path: str = None, sql_parser=None):
         """
         Initializes the cursor.
 
@@ -18,89 +53,240 @@ class GraphSQLCursor:
             endpoint (str): The GraphQL API URL.
             headers (dict, optional): Authentication headers.
             output_format (str): Format for tabular data (csv, parquet, jsonl).
+            mappings_path (str, optional): Pre-resolved mappings JSON path.
+            relations_path (str, optional): Pre-resolved relations JSON path.
+            sql_parser (SQLParser, optional): Shared parser owned by the connection.
         """
         self.endpoint = endpoint
         self.headers = headers or {}
         self.output_format = output_format
+        self.sql_parser = sql_parser
+        self.arraysize = 1
+        self._fetcher = None
         self._closed = False
         self._results = None
+        self._results_reader = None
+        self._results_table = None
+        self._batch_rows = collections.deque()
+        self._row_idx = 0
         self._description = None
 
+        # The connection already derived these from the endpoint hash; only
+        # recompute when the cursor is constructed standalone.
+        if mappings_path is None or relations_path is None:
+            hash_value = endpoint_hash(endpoint)
+            mappings_path = f"schemas/mappings_{hash_value}.json"
+            relations_path = f"schemas/relations_{hash_value}.json"
+        self.mappings_path = mappings_path
+        self.relations_path = relations_path
+
+    def _get_fetcher(self):
+        """
+        Lazily builds the DataFetch for this cursor and reuses it across
+        executes, so its HTTP session and connection pool stay warm instead of
+        being rebuilt per statement.
+        """
+        if self._fetcher is None:
+            auth = self.headers.get("Authorization", None) if self.headers else None
+            additional_headers = {k: v for k, v in self.headers.items() if k not in {"Authorization", "is_http"}}
+            self._fetcher = DataFetch(
+                self.endpoint,
+                auth_token=auth,
+                additional_headers=additional_headers,
+            )
+        return self._fetcher
+
     def execute(self, statement, parameters=None, context=None):
         """
         Executes an SQL query by translating it to GraphQL and applying remaining filters in DuckDB.
         """
         if self._closed:
             raise Exception("Cursor is closed.")
-        
-        parsed_url = urlparse(self.endpoint)
-        cleaned_endpoint = parsed_url.netloc if parsed_url.scheme in ["http", "https", "graphsql"] else self.endpoint
-        endpoint_hash = hashlib.md5(cleaned_endpoint.encode()).hexdigest()[:10]
-        mappings_path = f"schemas/mappings_{endpoint_hash}.json"
-        relations_path = f"schemas/relations_{endpoint_hash}.json"
 
-        parsed_data = SQLParser(mappings_path=mappings_path, relations_path=relations_path).convert_to_graphql(statement)
+        if self.sql_parser is None:
+            mappings = _load_mapping(self.mappings_path, os.stat(self.mappings_path).st_mtime_ns)
+            relations = _load_mapping(self.relations_path, os.stat(self.relations_path).st_mtime_ns)
+            self.sql_parser = SQLParser(mappings=mappings, relations=relations)
+        parsed_data = self.sql_parser.convert_to_graphql(statement)
         graphql_queries = parsed_data.get("graphql_queries", "")
 
+        cache_key = hashlib.blake2b(
+            f"{self.endpoint}\x00{statement}".encode("utf-8", "ignore"), digest_size=16
+        ).hexdigest()
+        table_name = self._cached_table(cache_key)
+        if table_name is None:
+            # fetch_json keeps the responses in memory on their way into
+            # DuckDB; the response files only serve as the TTL cache.
+            responses = self._get_fetcher().fetch_json(graphql_queries)
+
+            # The table is named after the cache key, not the FROM table:
+            # WHERE filters are pushed into the GraphQL query, so two
+            # statements over the same table hold different rows and must
+            # never share a materialized table.
+            table_name = f"result_{cache_key}"
+            JSONToTabular(output_format="duckdb", depth_cutoff=5, table_name=table_name).convert_responses(responses)
+            self._remember_table(cache_key, table_name)
+
+        sql_post_processor = SQLPostProcessor(parsed_data, table_name=table_name)
+        result_table = sql_post_processor.execute()
+
+        self._results = None
+        # Expose the result as a record-batch stream so fetchmany converts
+        # one batch of rows to Python tuples at a time; fetch_arrow and
+        # fetchall drain the same reader.
+        self._results_reader = result_table.to_reader(max_chunksize=10_000)
+        self._results_table = None
+        self._batch_rows.clear()
+        self._row_idx = 0
+        self._description = [(name, None) for name in result_table.column_names]
+
+        logger.debug("Final processed result columns: %s", result_table.column_names)
         
-        if self.headers:
-            auth = self.headers.get("Authorization", None)
-            additional_headers = {k: v for k, v in self.headers.items() if k not in {"Authorization", "is_http"}} if self.headers else {}
-            json_files_path = DataFetch(
-                self.endpoint,
-                auth_token=auth,
-                additional_headers=additional_headers
-            ).fetch_data(graphql_queries)
-            if auth:
-                json_files_path = DataFetch(self.endpoint, auth_token=auth, additional_headers=additional_headers).fetch_data(graphql_queries)
-            else:
-                json_files_path = DataFetch(self.endpoint, additional_headers=additional_headers).fetch_data(graphql_queries)
-        else:
-            json_files_path = DataFetch(self.endpoint).fetch_data(graphql_queries)
-
-        table_name = (
-            parsed_data.get("subquery_alias")
-            or parsed_data.get("table")
-            or "virtual_table"
-        )
-        JSONToTabular(output_format="duckdb", depth_cutoff=5, table_name=table_name).convert(json_paths=json_files_path)
-        self._load_results(table_name=table_name)
-
-        sql_post_processor = SQLPostProcessor(parsed_data)
-        result_df = sql_post_processor.execute()
-
-        self._results = result_df.to_records(index=False)
-        self._description = [(col, None) for col in result_df.columns]
-
-        print("\n✅ Final Processed Results (Columns):", result_df.columns)
-        print(result_df.head())
-        
-    def _load_results(self, table_name):
-        """Loads the tabular data from DuckDB instead of reading from a file."""
+    @classmethod
+    def _cached_table(cls, cache_key):
+        """
+        Returns the DuckDB table holding a previous execution of the same
+        statement, or None when the entry is missing or older than the TTL.
+        """
+        with cls._table_cache_lock:
+            entry = cls._table_cache.get(cache_key)
+            if entry is None:
+                return None
+            table_name, stored_at = entry
+            if time.time() - stored_at >= cls._table_cache_ttl:
+                del cls._table_cache[cache_key]
+                return None
+            cls._table_cache.move_to_end(cache_key)
+            return table_name
 
-        con = DuckDBSingleton.get_connection()
-        df = con.execute(f"SELECT * FROM {table_name} LIMIT 5").fetchdf()
-        self._results = con.execute(f"SELECT * FROM {table_name}").fetchall()
-        self._description = [(col, None) for col in df.columns]
+    @classmethod
+    def _remember_table(cls, cache_key, table_name):
+        """Records a freshly materialized table, evicting the oldest entries past the cap."""
+        evicted = []
+        with cls._table_cache_lock:
+            cls._table_cache[cache_key] = (table_name, time.time())
+            cls._table_cache.move_to_end(cache_key)
+            while len(cls._table_cache) > cls._table_cache_size:
+                _, (evicted_table, _) = cls._table_cache.popitem(last=False)
+                evicted.append(evicted_table)
+        # Table names are unique per cache key, so evicted tables have no
+        # other readers; drop them outside the lock, on a cursor of our own
+        # rather than the shared connection.
+        if evicted:
+            con = DuckDBSingleton.get_cursor()
+            try:
+                for evicted_table in evicted:
+                    con.execute(f"DROP TABLE IF EXISTS {evicted_table}")
+            finally:
+                con.close()
 
-        print("\n✅ Loaded Results (Columns):", df.columns)
-        print(df.head())
+    @classmethod
+    def invalidate(cls):
+        """Clears the statement-result cache, forcing the next execute to refetch."""
+        with cls._table_cache_lock:
+            cls._table_cache.clear()
 
-    def fetchall(self):
-        """Returns all rows of the last executed query."""
+    def _materialized_results(self):
+        """Synthesizes row tuples from the columnar/Arrow result exactly once."""
         if self._results is None:
-            raise Exception("No query executed.")
-        return list(self._results)
+            if self._results_reader is not None or self._results_table is not None or self._batch_rows:
+                rows = []
+                if self._results_table is None and self._results_reader is not None:
+                    self._results_table = self._results_reader.read_all()
+                    self._results_reader = None
+                if self._results_table is not None:
+                    rows = list(zip(*(column.to_pylist() for column in self._results_table.columns)))
+                    self._results_table = None
+                # Rows already pulled off the stream by fetchmany but not yet
+                # returned come first.
+                if self._batch_rows:
+                    rows = list(self._batch_rows) + rows
+                    self._batch_rows.clear()
+                self._results = rows
+            else:
+                raise Exception("No query executed.")
+        return self._results
+
+    def fetchall(self):
+        """
+        Returns all remaining rows of the last executed query. When nothing
+        has been consumed yet the materialized list is returned as-is —
+        DBAPI asks for a sequence, not a fresh copy, and duplicating
+        millions of row tuples is pure allocator pressure.
+        """
+        results = self._materialized_results()
+        rows = results if self._row_idx == 0 else results[self._row_idx:]
+        self._row_idx = len(results)
+        return rows
+
+    def fetchmany(self, size=None):
+        """
+        Returns up to `size` rows (default: arraysize). While the Arrow stream
+        is live, only one record batch at a time is converted to Python
+        tuples, so large results never hold the GIL for a full-table
+        conversion.
+        """
+        if size is None:
+            size = self.arraysize
+        if self._results is None and (self._results_reader is not None or self._batch_rows):
+            while len(self._batch_rows) < size and self._results_reader is not None:
+                try:
+                    batch = self._results_reader.read_next_batch()
+                except StopIteration:
+                    self._results_reader = None
+                    break
+                self._batch_rows.extend(zip(*(column.to_pylist() for column in batch.columns)))
+            rows = [self._batch_rows.popleft() for _ in range(min(size, len(self._batch_rows)))]
+            if self._results_reader is None and not self._batch_rows:
+                # Stream fully consumed; later fetches see an empty remainder.
+                self._results = []
+                self._row_idx = 0
+            return rows
+        results = self._materialized_results()
+        rows = results[self._row_idx:self._row_idx + size]
+        self._row_idx += len(rows)
+        return rows
+
+    def fetch_arrow(self):
+        """
+        Returns the remaining result set as a pyarrow.Table — the columnar
+        data crosses from DuckDB without any per-cell Python object work.
+        Subsequent tuple fetches still see the same rows.
+        """
+        if self._results_table is None and self._results_reader is not None:
+            self._results_table = self._results_reader.read_all()
+            self._results_reader = None
+        if self._results_table is not None:
+            if self._batch_rows:
+                # Rows fetchmany pulled off the stream but has not returned
+                # are still remaining; put them back in front of the tail.
+                names = self._results_table.column_names
+                buffered = pa.table(
+                    {name: [row[i] for row in self._batch_rows] for i, name in enumerate(names)},
+                    schema=self._results_table.schema,
+                )
+                self._results_table = pa.concat_tables([buffered, self._results_table])
+                self._batch_rows.clear()
+            return self._results_table
+        if self._results is not None or self._batch_rows:
+            rows = self._materialized_results()[self._row_idx:]
+            columns = self.description or []
+            return pa.table({name: [row[i] for row in rows] for i, (name, _) in enumerate(columns)})
+        raise Exception("No query executed.")
 
     def fetchone(self):
-        """Returns a single row from the last executed query."""
-        if self._results is None:
-            raise Exception("No query executed.")
-        return self._results[0] if self._results else None
+        """Returns the next row from the last executed query."""
+        results = self._materialized_results()
+        if self._row_idx >= len(results):
+            return None
+        row = results[self._row_idx]
+        self._row_idx += 1
+        return row
 
     def close(self):
         """Closes the cursor."""
         self._closed = True
+        self._fetcher = None
 
     @property
     def description(self):
@@ -108,5 +294,5 @@ class GraphSQLCursor:
         return self._description
 
     def __iter__(self):
-        """Allow iteration over results like a real cursor."""
-        return iter(self.fetchall())
\ No newline at end of file
+        """Iterates over the remaining rows like a real cursor."""
+        return iter(self.fetchone, None)
\ No newline at end of file
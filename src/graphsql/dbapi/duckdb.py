@@ -1,11 +1,51 @@
+import os
+import threading
+
 import duckdb
 
 class DuckDBSingleton:
     _instance = None
+    _lock = threading.Lock()
+    _database = ":memory:"
+
+    @staticmethod
+    def configure(database):
+        """
+        Points the singleton at a database file (e.g. "graphsql.duckdb") so
+        ingested tables survive process restarts. Must be called before the
+        first get_connection(); the default stays in-memory.
+        """
+        with DuckDBSingleton._lock:
+            if DuckDBSingleton._instance is not None:
+                raise RuntimeError("DuckDB connection already initialized; configure() must be called first.")
+            DuckDBSingleton._database = database
 
     @staticmethod
     def get_connection():
-        """Returns a single shared DuckDB connection."""
+        """
+        Returns a single shared DuckDB connection. Extensions and pragmas are
+        configured exactly once here, at initialization under the lock, so no
+        per-query path ever pays for them again.
+        """
         if DuckDBSingleton._instance is None:
-            DuckDBSingleton._instance = duckdb.connect(database=":memory:")
-        return DuckDBSingleton._instance
\ No newline at end of file
+            with DuckDBSingleton._lock:
+                if DuckDBSingleton._instance is None:
+                    con = duckdb.connect(database=DuckDBSingleton._database)
+                    try:
+                        con.execute("LOAD json; LOAD parquet;")
+                    except duckdb.Error:
+                        # Bundled builds autoload these on first use.
+                        pass
+                    con.execute(f"PRAGMA threads={os.cpu_count()}")
+                    con.execute("PRAGMA enable_object_cache=true")
+                    DuckDBSingleton._instance = con
+        return DuckDBSingleton._instance
+
+    @staticmethod
+    def get_cursor():
+        """
+        Returns a dedicated cursor on the shared connection. A raw DuckDB
+        connection serializes concurrent queries on an internal mutex, so each
+        thread should execute through its own cursor.
+        """
+        return DuckDBSingleton.get_connection().cursor()
@@ -1,8 +1,12 @@
-import hashlib
+import functools
+import itertools
 import json
-from urllib.parse import urlparse
+import logging
+import os
+import weakref
 
 from graphsql.dbapi.connection import GraphSQLConnection
+from graphsql.introspection.introspection import endpoint_hash
 
 from sqlalchemy.engine.default import DefaultDialect
 from sqlalchemy.dialects import registry
@@ -13,6 +17,102 @@ try:
 except ImportError:
     ARRAY = None
 
+logger = logging.getLogger(__name__)
+
+# Shared, pre-instantiated SA type singletons: reflection maps K tables x C
+# columns, and allocating a fresh TypeEngine per column is pure churn.
+_INTEGER, _FLOAT, _BOOLEAN = Integer(), Float(), Boolean()
+_GQL_TYPE_MAP = {
+    "int": _INTEGER,
+    "id": _INTEGER,
+    "number": _INTEGER,
+    "float": _FLOAT,
+    "double": _FLOAT,
+    "decimal": _FLOAT,
+    "boolean": _BOOLEAN,
+    "bool": _BOOLEAN,
+}
+_DEFAULT_SA_TYPE = String()
+
+
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path, mtime):
+    """
+    Parses a mappings/relations JSON file, memoized on (path, mtime) so
+    reflection calls — get_columns runs once per table — reuse the parsed
+    dict instead of re-reading the file each time.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _query_field_targets(path, mtime):
+    """
+    Prebuilt {field: target} index over relations["Query"], cached alongside
+    the JSON parse so get_columns resolves a table's target type with one
+    dict lookup instead of a list walk per table.
+    """
+    relations = _load_json_cached(path, mtime)
+    return {
+        rel["field"]: rel["target"]
+        for rel in relations.get("Query", [])
+        if "field" in rel and "target" in rel
+    }
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_columns(mappings_path, relations_path, table_name, mappings_mtime, relations_mtime):
+    """
+    Builds the reflected column dicts for one table, cached process-wide —
+    the inputs are file-backed and immutable per process, so every
+    connection shares one computation per (table, file version).
+    """
+    mappings = _load_json_cached(mappings_path, mappings_mtime)
+    relations = _load_json_cached(relations_path, relations_mtime)
+
+    target_type = _query_field_targets(relations_path, relations_mtime).get(table_name)
+    if not target_type:
+        logger.warning("No target type found for %s. Returning empty column list.", table_name)
+        return ()
+
+    # One comprehension builds all scalar columns — no per-iteration
+    # list.append method lookup.
+    columns = [
+        {"name": col_name, "type": _GQL_TYPE_MAP.get(col_gql_type.lower(), _DEFAULT_SA_TYPE),
+         "nullable": True, "default": None}
+        for col_name, col_gql_type in mappings.get(target_type, {}).items()
+    ]
+
+    for rel in relations.get(target_type, []):
+        field_name = rel.get("field")
+        relation_type = rel.get("relation")
+        target_object = rel.get("target")
+
+        if not field_name or not target_object:
+            continue
+
+        if relation_type in ["many-to-one", "one-to-one"]:
+            sa_type = String()
+            field_name_display = f"{field_name} : {target_object}"
+        elif relation_type in ["one-to-many", "many-to-many"]:
+            if ARRAY:
+                sa_type = ARRAY(String())
+                field_name_display = f"{field_name} : [{target_object}]"
+            else:
+                sa_type = JSON()
+                field_name_display = f"{field_name} : [{target_object}]"
+
+        columns.append({
+            "name": field_name_display,
+            "type": sa_type,
+            "nullable": True,
+            "default": None,
+            "graphql_object": target_object,
+        })
+
+    return tuple(columns)
+
 
 class GraphSQLDialect(DefaultDialect):
     """Custom SQLAlchemy dialect for GraphSQL."""
@@ -26,11 +126,36 @@ class GraphSQLDialect(DefaultDialect):
     preexecute_autoincrement_sequences = False
     postfetch_lastrowid = False
     supports_multivalues_insert = True
-    
-    def _load_json(self, path):
-        with open(path, "r") as f:
-            return json.load(f)
-    
+    # Must be declared on the concrete dialect (SQLAlchemy ignores inherited
+    # values); without it every statement is recompiled on each execution.
+    supports_statement_cache = True
+
+    # Schema file paths per engine; the engine URL never changes, so the
+    # urlparse + hash run once per engine instead of per reflection call.
+    _engine_paths_cache = weakref.WeakKeyDictionary()
+
+    def _paths_for(self, connection):
+        """
+        Returns (mappings_path, relations_path) for the connection's engine,
+        memoized per engine — the URL is immutable, so the parse and hash run
+        once instead of on every reflection call.
+        """
+        engine = connection.engine
+        paths = self._engine_paths_cache.get(engine)
+        if paths is None:
+            # GraphSQLConnection already resolved these at connect time;
+            # reuse them rather than re-hashing the URL here.
+            dbapi_conn = getattr(connection, "connection", None)
+            mappings_path = getattr(dbapi_conn, "mappings_path", None)
+            relations_path = getattr(dbapi_conn, "relations_path", None)
+            if mappings_path and relations_path:
+                paths = (mappings_path, relations_path)
+            else:
+                hash_value = endpoint_hash(str(engine.url))
+                paths = (f"schemas/mappings_{hash_value}.json", f"schemas/relations_{hash_value}.json")
+            self._engine_paths_cache[engine] = paths
+        return paths
+
     @reflection.cache
     def get_schema_names(self, connection, **kw):
         """
@@ -38,7 +163,7 @@ class GraphSQLDialect(DefaultDialect):
         For many databases, there's a system query here.
         For GraphQL, you can either return a single dummy schema or multiple if you want.
         """
-        print("Getting Schemas")
+        logger.debug("Getting schemas")
         # If your GraphQL doesn't have a concept of schemas, just return one
         return ["main"]
 
@@ -50,38 +175,18 @@ class GraphSQLDialect(DefaultDialect):
         - Scalar fields from `mappings.json` under "Query".
         - Complex fields from `relations.json` under "Query".
         """
-        print("Get Table Names: ")
-        
-        endpoint_url = str(connection.engine.url)
-        parsed_url = urlparse(endpoint_url)
-        
-        print(" URL: ", endpoint_url)
-        print(" Parsed URL: ", parsed_url)
-        print(" Parsed URL Scheme: ", parsed_url.scheme)
-        
-        if parsed_url.scheme in ["http", "https", "graphsql"]:
-            print(" Parsed URL netloc: ", parsed_url.netloc)
-            print(" Parsed URL path: ", parsed_url.path)
-            cleaned_endpoint = parsed_url.netloc
-        else:
-            cleaned_endpoint = endpoint_url
-            
-        print(" Cleaned Endpoint: ", cleaned_endpoint)
-        endpoint_hash = hashlib.md5(cleaned_endpoint.encode()).hexdigest()[:10]
-        print(" Endpoint Hash: ", endpoint_hash)
-        mappings_path = f"schemas/mappings_{endpoint_hash}.json"
-        relations_path = f"schemas/relations_{endpoint_hash}.json"
-        
+        mappings_path, relations_path = self._paths_for(connection)
+
         mappings = self._load_json(mappings_path)
         relations = self._load_json(relations_path)
         
-        scalar_fields = list(mappings.get("Query", {}).keys())
-        print("Scalar fields under Query: ", scalar_fields)
-        complex_fields = [entry["field"] for entry in relations.get("Query", []) if "field" in entry]
-        print("Complex fields under Query: ", complex_fields)
-        
-        table_names = list(set(scalar_fields + complex_fields))
-        
+        # dict.fromkeys dedupes in one pass while keeping schema order, so
+        # the result is deterministic for downstream caches.
+        table_names = list(dict.fromkeys(itertools.chain(
+            mappings.get("Query", {}),
+            (entry["field"] for entry in relations.get("Query", []) if "field" in entry),
+        )))
+
         return table_names
 
     @reflection.cache
@@ -90,7 +195,6 @@ class GraphSQLDialect(DefaultDialect):
         If you want to treat certain GraphQL objects as 'views', return them here.
         Otherwise, return an empty list.
         """
-        print("Getting Views")
         return []
     
     @reflection.cache
@@ -128,94 +232,34 @@ class GraphSQLDialect(DefaultDialect):
 
     @reflection.cache
     def get_columns(self, connection, table_name, schema=None, **kw):
-        print("Getting Columns for:", table_name)
-
-        endpoint_url = str(connection.engine.url)
-        parsed_url = urlparse(endpoint_url)
-        if parsed_url.scheme in ["http", "https", "graphsql"]:
-            cleaned_endpoint = parsed_url.netloc
-        else:
-            cleaned_endpoint = endpoint_url
-        endpoint_hash = hashlib.md5(cleaned_endpoint.encode()).hexdigest()[:10]
-        mappings_path = f"schemas/mappings_{endpoint_hash}.json"
-        relations_path = f"schemas/relations_{endpoint_hash}.json"
+        mappings_path, relations_path = self._paths_for(connection)
 
-        mappings = self._load_json(mappings_path)
-        relations = self._load_json(relations_path)
-
-        columns = []
-
-        query_relations = relations.get("Query", [])
-        target_type = None
-        for rel in query_relations:
-            if rel.get("field") == table_name:
-                target_type = rel.get("target")
-                break
-
-        if not target_type:
-            print(f"⚠️ Warning: No target type found for {table_name}. Returning empty column list.")
+        try:
+            mtimes = (os.path.getmtime(mappings_path), os.path.getmtime(relations_path))
+        except OSError as e:
+            logger.warning("Error loading JSON for %s: %s", table_name, e)
             return []
 
-        scalar_fields = mappings.get(target_type, {})
-        for col_name, col_gql_type in scalar_fields.items():
-            sa_type = self._map_graphql_to_sa_type(col_gql_type)
-            columns.append({
-                "name": col_name,
-                "type": sa_type,
-                "nullable": True,
-                "default": None,
-            })
-
-        target_relations = relations.get(target_type, [])
-        for rel in target_relations:
-            field_name = rel.get("field")
-            relation_type = rel.get("relation")
-            target_object = rel.get("target")
-
-            if not field_name or not target_object:
-                continue
-
-            if relation_type in ["many-to-one", "one-to-one"]:
-                sa_type = String()
-                field_name_display = f"{field_name} : {target_object}"
-            elif relation_type in ["one-to-many", "many-to-many"]:
-                if ARRAY:
-                    sa_type = ARRAY(String())
-                    field_name_display = f"{field_name} : [{target_object}]"
-                else:
-                    sa_type = JSON()
-                    field_name_display = f"{field_name} : [{target_object}]"
-
-            columns.append({
-                "name": field_name_display,
-                "type": sa_type,
-                "nullable": True,
-                "default": None,
-                "graphql_object": target_object,
-            })
-
-        print(f"✅ Columns for {table_name}: {columns}")
-        return columns
+        # @reflection.cache is per-connection; Superset opens many
+        # connections per worker, so the actual column build is cached
+        # process-wide on (paths, table, mtimes). Hand back fresh dicts so
+        # callers can mutate them without poisoning the cache.
+        columns = _compute_columns(mappings_path, relations_path, table_name, *mtimes)
+        if logger.isEnabledFor(logging.DEBUG):
+            # The guard matters: formatting reprs every SA type object.
+            logger.debug("Columns for %s: %s", table_name, columns)
+        return [dict(column) for column in columns]
 
     def _map_graphql_to_sa_type(self, gql_type):
-        """Map a GraphQL scalar type to a SQLAlchemy type instance."""
-        gql_lower = gql_type.lower()
-        if gql_lower in ["int", "id", "number"]:
-            return Integer()
-        elif gql_lower in ["float", "double", "decimal"]:
-            return Float()
-        elif gql_lower in ["boolean", "bool"]:
-            return Boolean()
-        else:
-            return String()
+        """Map a GraphQL scalar type to a shared SQLAlchemy type instance."""
+        return _GQL_TYPE_MAP.get(gql_type.lower(), _DEFAULT_SA_TYPE)
 
     def _load_json(self, path):
-        """Load JSON from a file, handle errors gracefully."""
+        """Load JSON from a file through the mtime-keyed memo, handle errors gracefully."""
         try:
-            with open(path, "r") as f:
-                return json.load(f)
+            return _load_json_cached(path, os.path.getmtime(path))
         except Exception as e:
-            print(f"Error loading JSON from {path}: {e}")
+            logger.warning("Error loading JSON from %s: %s", path, e)
             return {}
     
     @classmethod
@@ -230,6 +274,10 @@ class GraphSQLDialect(DefaultDialect):
         from graphsql.dbapi import connection
         return connection
 
+    # Parsed connect args per rendered URL. Pools invoke create_connect_args on
+    # every checkout, so repeat connections to the same URL skip the re-parse.
+    _connect_args_cache = {}
+
     def create_connect_args(self, url):
         """
         Parse the SQLAlchemy connection URL and return args for GraphSQLConnection.
@@ -238,6 +286,11 @@ class GraphSQLDialect(DefaultDialect):
         instead of "https".
         All other query parameters (except 'auth' and 'is_http') are treated as headers.
         """
+        cache_key = str(url)
+        cached = GraphSQLDialect._connect_args_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         is_http = url.query.get("is_http", "0")
         scheme = "http" if is_http == "1" else "https"
 
@@ -248,18 +301,16 @@ class GraphSQLDialect(DefaultDialect):
         if url.database:
             endpoint += f"/{url.database}"
 
-        headers = {}
-        for key, value in url.query.items():
-            if key not in {"auth", "is_http"}:
-                headers[key] = value
+        headers = {key: value for key, value in url.query.items() if key not in {"auth", "is_http"}}
 
         if "auth" in url.query:
             headers["Authorization"] = url.query["auth"]
-            
-        print("Url: ", url)
-        print("Endpoint: ", endpoint)
 
-        return (endpoint,), {"headers": headers}
+        logger.debug("Parsed connect args for %s -> %s", url, endpoint)
+
+        connect_args = (endpoint,), {"headers": headers}
+        GraphSQLDialect._connect_args_cache[cache_key] = connect_args
+        return connect_args
 
     def do_execute(self, cursor, statement, parameters, context=None):
         """
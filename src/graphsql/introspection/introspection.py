@@ -1,14 +1,67 @@
+import functools
 import requests
 import json
+import logging
 import os
 import hashlib
 import importlib.resources as pkg_resources
 
 from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson  # C-native JSON, much faster than stdlib
+except ImportError:
+    orjson = None
+
+
+@functools.lru_cache(maxsize=1)
+def _introspection_query():
+    """Reads the static introspection query once per process."""
+    return pkg_resources.files("graphsql.introspection").joinpath("introspection_query.graphql").read_text()
+
+
+_KNOWN_SCHEMES = frozenset({"http", "https", "graphsql"})
+
+
+def clean_endpoint(endpoint):
+    """Strips the scheme from an endpoint URL so hashing is scheme-agnostic."""
+    parsed_url = urlparse(endpoint)
+    if parsed_url.scheme in _KNOWN_SCHEMES:
+        return parsed_url.netloc
+    return endpoint
+
+
+@functools.lru_cache(maxsize=256)
+def endpoint_hash(endpoint):
+    """
+    Derives the short hash used in schema/mappings/relations filenames,
+    computed at most once per distinct endpoint per process.
+    BLAKE2b produces the 10-hex-char name natively via digest_size=5 —
+    no wasted digest bytes to truncate, and it outruns the legacy hashes on
+    short inputs. Every module that builds schema paths must go through this
+    helper so the filenames stay consistent.
+    """
+    return hashlib.blake2b(clean_endpoint(endpoint).encode(), digest_size=5).hexdigest()
+
+
 class GraphQLIntrospection:
     """
     Handles fetching and caching of GraphQL schemas via introspection.
     """
+
+    # Shared across instances so repeated introspections (several endpoints,
+    # retries) reuse pooled keep-alive connections instead of paying a fresh
+    # TCP+TLS handshake per fetch.
+    _session = None
+
+    @classmethod
+    def _get_session(cls):
+        if cls._session is None:
+            cls._session = requests.Session()
+        return cls._session
+
     def __init__(self, endpoint, schema_dir="schemas"):
         """
         Initializes the introspection handler.
@@ -20,22 +73,18 @@ class GraphQLIntrospection:
         os.makedirs(self.schema_dir, exist_ok=True)
         self.schema_filename = self._generate_schema_filename()
         self.schema_path = os.path.join(self.schema_dir, self.schema_filename)
+        self._parsed_schema = None
+        self._schema_known_present = False
 
     def _generate_schema_filename(self):
         """
         Generates a unique filename based on the endpoint URL.
         :return: Hashed filename for schema storage.
         """
-        parsed_url = urlparse(self.endpoint)
-        if parsed_url.scheme in ["http", "https", "graphsql"]:
-            self.cleaned_endpoint = parsed_url.netloc
-        else:
-            self.cleaned_endpoint = self.endpoint
-        endpoint_hash = hashlib.md5(self.cleaned_endpoint.encode()).hexdigest()[:10]
-        print("Introspection: ")
-        print(" Cleaned Endpoint: ", self.cleaned_endpoint)
-        print(" Endpoint Hash: ", endpoint_hash)
-        return f"schema_{endpoint_hash}.json"
+        self.cleaned_endpoint = clean_endpoint(self.endpoint)
+        hash_value = endpoint_hash(self.endpoint)
+        logger.debug("Introspection: cleaned endpoint %s, hash %s", self.cleaned_endpoint, hash_value)
+        return f"schema_{hash_value}.json"
 
     def fetch_schema(self):
         """
@@ -43,33 +92,54 @@ class GraphQLIntrospection:
         :return: Parsed schema types.
         """
         
-        schema_file = pkg_resources.files("graphsql.introspection").joinpath("introspection_query.graphql")
+        introspection_query_str = _introspection_query()
 
-        with schema_file.open("r") as file:
-            introspection_query_str = file.read()
-          
-        response = requests.post(self.endpoint, json={"query": introspection_query_str})
+        response = self._get_session().post(self.endpoint, json={"query": introspection_query_str})
         response.raise_for_status()
-        schema = response.json()
+        raw = response.content
+        schema = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
         if "data" not in schema or "__schema" not in schema["data"]:
             raise ValueError("Invalid schema response from GraphQL endpoint.")
-        
-        with open(self.schema_path, "w") as file:
-            json.dump(schema, file, indent=2)
-        
+
+        # Store the response bytes verbatim — re-serializing a large schema
+        # with indentation just burns CPU on object churn.
+        with open(self.schema_path, "wb") as file:
+            file.write(raw)
+
         print(f"✅ GraphQL schema saved to {self.schema_path}")
+        self._parsed_schema = schema
         return schema
 
     def load_schema(self):
         """
-        Loads the cached schema from file if available, otherwise fetches a new one.
-        :return: Parsed schema types.
+        Ensures the schema file exists, fetching it if necessary.
+        :return: Path to the cached schema file.
         """
-        if os.path.exists(self.schema_path):
-            self.schema_path
+        # The schema file is only ever written, never deleted, during the
+        # process lifetime, so the first positive check is authoritative and
+        # repeated calls skip the stat syscall.
+        if self._schema_known_present:
+            return self.schema_path
+        if os.path.isfile(self.schema_path):
+            self._schema_known_present = True
             return self.schema_path
-            
+
         print("⚠️ No cached schema found. Fetching...")
         self.fetch_schema()
+        self._schema_known_present = True
         return self.schema_path
+
+    def load_schema_data(self):
+        """
+        Returns the parsed schema dict, memoized on the instance so repeated
+        consumers never re-read or re-parse the file.
+        """
+        if self._parsed_schema is None:
+            if os.path.exists(self.schema_path):
+                with open(self.schema_path, "rb") as file:
+                    raw = file.read()
+                self._parsed_schema = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            else:
+                self.fetch_schema()
+        return self._parsed_schema
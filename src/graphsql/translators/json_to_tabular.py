@@ -1,11 +1,150 @@
+import itertools
+import logging
 import os
 import json
 import hashlib
-import pandas as pd
-import numpy as np
+import pyarrow as pa
+
+from concurrent.futures import ProcessPoolExecutor
 
 from graphsql.dbapi.duckdb import DuckDBSingleton
 
+try:
+    import orjson  # C-native JSON, much faster than stdlib
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_EXHAUSTED = object()
+
+# (root_key, parent_key, key) -> final column name. GraphQL responses repeat
+# the same key paths across every row, so the f-string join and root-prefix
+# strip run once per distinct path instead of once per node visit.
+_KEY_CACHE = {}
+_KEY_CACHE_MAX = 4096
+
+
+def _flatten_json(obj, parent_key, depth, root_key, depth_cutoff):
+    """
+    Iterative core of JSONToTabular.flatten_json: an explicit-stack
+    post-order walk that merges each child's row-list at the parent frame,
+    so no Python call frame is allocated per JSON node. Frames are
+    [is_dict, rows, child_iterator, parent_key, depth, root_key].
+    """
+    frames = []
+    task = (obj, parent_key, depth, root_key)
+    result = None
+    key_cache_get = _KEY_CACHE.get
+
+    while True:
+        if task is not None:
+            node, pk, d, rk = task
+            task = None
+            if not isinstance(node, (dict, list)) or d >= depth_cutoff:
+                result = [{pk: node}] if pk else [{}]
+            elif isinstance(node, list):
+                frames.append([False, [], iter(node), pk, d, rk])
+                continue
+            else:
+                if d == 0:
+                    rk = pk
+                frames.append([True, [{}], iter(node.items()), pk, d, rk])
+                continue
+
+        if result is not None:
+            if not frames:
+                return result
+            frame = frames[-1]
+            if frame[0]:
+                # Cross-merge the child's rows into the rows built so far.
+                # Scalar fields (and any child producing exactly one row) are
+                # the overwhelming case: update the frame's rows in place —
+                # they are owned by this frame — instead of copying every row
+                # dict per field. Only a genuine row explosion pays for the
+                # cross product.
+                if result:
+                    if len(result) == 1:
+                        fv = result[0]
+                        for r in frame[1]:
+                            r.update(fv)
+                    else:
+                        frame[1] = [dict(r, **fv) for r in frame[1] for fv in result]
+            else:
+                frame[1].extend(result)
+            result = None
+
+        frame = frames[-1]
+        child = next(frame[2], _EXHAUSTED)
+        if child is _EXHAUSTED:
+            result = frame[1]
+            frames.pop()
+            continue
+        pk, d, rk = frame[3], frame[4], frame[5]
+        if frame[0]:
+            key, value = child
+            cache_key = (rk, pk, key)
+            new_key = key_cache_get(cache_key)
+            if new_key is None:
+                new_key = f"{pk}.{key}" if pk else key
+                if rk and new_key.startswith(rk + "."):
+                    new_key = new_key[len(rk) + 1:]
+                if len(_KEY_CACHE) >= _KEY_CACHE_MAX:
+                    _KEY_CACHE.clear()
+                _KEY_CACHE[cache_key] = new_key
+            task = (value, new_key, d + 1, rk)
+        else:
+            task = (child, "" if d == 0 else pk, d + 1, rk)
+
+
+def _is_flat_record_list(value):
+    """True when value is a non-empty list of dicts holding only scalars."""
+    if not isinstance(value, list) or not value:
+        return False
+    for item in value:
+        if type(item) is not dict:
+            return False
+        for v in item.values():
+            if isinstance(v, (dict, list)):
+                return False
+    return True
+
+
+def _flatten_payload(data, source, depth_cutoff):
+    """Flattens one parsed GraphQL response into a list of row dicts."""
+    if "data" not in data:
+        raise ValueError(f"Invalid GraphQL response format in {source}: 'data' field missing.")
+
+    records = []
+    for key, value in data["data"].items():
+        # The common response shape — {"data": {"X": [flat rows]}} — needs no
+        # flattening at all: the top-level key is stripped from column names
+        # and every value is already a scalar, so the items are the rows.
+        # (With depth_cutoff < 2 the generic walk truncates instead.)
+        if depth_cutoff >= 2 and _is_flat_record_list(value):
+            records.extend(value)
+        else:
+            records.extend(_flatten_json(value, key, 0, None, depth_cutoff))
+    return records
+
+
+def _parse_and_flatten(json_path, depth_cutoff):
+    """
+    Reads, parses and flattens one response file. Module-level so a process
+    pool can run it per file — each file is independent and the flatten loop
+    is pure Python, so workers sidestep the GIL entirely.
+    """
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return _flatten_payload(data, json_path, depth_cutoff)
+
+
+# Below this many files the pool's process spawn + IPC costs more than the
+# flatten work it spreads out.
+_PARALLEL_FILE_THRESHOLD = 4
+
+
 class JSONToTabular:
     """
     Converts multiple JSON responses from GraphQL queries into a single tabular format,
@@ -31,50 +170,103 @@ class JSONToTabular:
         - If the top-level key is a list (like 'products'), remove it from column names.
         - 'depth_cutoff' controls how deep we keep flattening nested objects.
         - If we hit a list, we replicate rows for each item.
+        The traversal itself lives in _flatten_json, which walks an explicit
+        stack instead of recursing node-per-node.
         """
-        if not isinstance(obj, (dict, list)) or depth >= self.depth_cutoff:
-            return [{parent_key: obj}] if parent_key else [{}]
-
-        if isinstance(obj, list):
-            all_rows = []
-            for item in obj:
-                flattened_item = self.flatten_json(item, "" if depth == 0 else parent_key, depth + 1, root_key)
-                all_rows.extend(flattened_item)
-            return all_rows
-
-        rows = [{}]
+        return _flatten_json(obj, parent_key, depth, root_key, self.depth_cutoff)
 
-        if depth == 0:
-            root_key = parent_key
+    def _generate_output_filename(self, json_paths):
+        """
+        Generate a unique output filename based on a hash of the input file paths.
+        """
+        hash_input = "|".join(sorted(json_paths)).encode()
+        # Plain fingerprint, no cryptographic requirement — BLAKE2b is the
+        # fastest stdlib digest and already names the schema files.
+        file_hash = hashlib.blake2b(hash_input, digest_size=16).hexdigest()
+        return f"output_{file_hash}.{self.output_format}"
 
-        for key, value in obj.items():
-            new_key = f"{parent_key}.{key}" if parent_key else key
-            if root_key and new_key.startswith(root_key + "."):
-                new_key = new_key[len(root_key) + 1:]
+    def _flatten_payload(self, data, source):
+        """Flattens one parsed GraphQL response into a list of row dicts."""
+        return _flatten_payload(data, source, self.depth_cutoff)
 
-            flattened_value = self.flatten_json(value, new_key, depth + 1, root_key)
+    def _iter_file_records(self, valid_paths):
+        """
+        Yields each file's flattened records in input order, fanning the
+        parse+flatten across cores for larger batches. Consumers that can
+        stream (jsonl) never hold more than one file's rows at a time.
+        """
+        if len(valid_paths) >= _PARALLEL_FILE_THRESHOLD and (os.cpu_count() or 1) > 1:
+            workers = min(os.cpu_count(), len(valid_paths))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(
+                    _parse_and_flatten, valid_paths, itertools.repeat(self.depth_cutoff)
+                )
+        else:
+            for json_path in valid_paths:
+                yield _parse_and_flatten(json_path, self.depth_cutoff)
 
-            if isinstance(flattened_value, list) and flattened_value and isinstance(flattened_value[0], dict):
-                new_rows = []
-                for existing_row in rows:
-                    for fv in flattened_value:
-                        merged = dict(existing_row, **fv)
-                        new_rows.append(merged)
-                rows = new_rows
-            else:
-                for r in rows:
-                    for fv in flattened_value:
-                        r.update(fv)
+    def _columnize(self, combined_records):
+        """
+        Transposes flattened row dicts into {column: value list} over the
+        union of keys in first-seen order — rows from different queries can
+        carry different fields, and missing keys become None. Downstream
+        consumers (Arrow, pandas) ingest the column arrays directly instead
+        of re-inferring a schema row by row.
+        """
+        keys = {}
+        for record in combined_records:
+            keys.update(dict.fromkeys(record))
+        return {key: [record.get(key) for record in combined_records] for key in keys}
 
-        return rows
+    def _store_duckdb(self, combined_records):
+        """
+        Ingests the flattened records through Arrow instead of pandas: DuckDB
+        scans the Arrow table zero-copy, skipping the DataFrame
+        materialization. The ingest runs on its own cursor, so concurrent
+        executes neither serialize on the shared connection nor see each
+        other's registrations.
+        """
+        columns = self._columnize(combined_records)
+        if columns:
+            arrow_records = pa.table(columns)
+        else:
+            # DuckDB rejects zero-column tables; keep the placeholder shape.
+            arrow_records = pa.table({"empty": pa.nulls(0)})
+        # The registration name must be unique per ingest: registrations live
+        # in the connection's shared namespace, and a fixed name lets two
+        # concurrent ingests overwrite each other between register and CREATE,
+        # materializing one statement's rows under the other's table.
+        registration = f"arrow_{self.table_name}"
+        con = DuckDBSingleton.get_cursor()
+        try:
+            con.register(registration, arrow_records)
+            con.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+            con.execute(f"CREATE TABLE {self.table_name} AS SELECT * FROM {registration}")
+            con.unregister(registration)
+        finally:
+            con.close()
+        logger.debug("Data stored in DuckDB's `%s`", self.table_name)
+        return self.table_name
 
-    def _generate_output_filename(self, json_paths):
+    def convert_responses(self, responses):
         """
-        Generate a unique output filename based on a hash of the input file paths.
+        Converts parsed GraphQL response dicts straight into the DuckDB table,
+        with no JSON file intermediate — the streaming counterpart of convert
+        for callers holding responses in memory (DataFetch.fetch_json).
+        :param responses: List of parsed GraphQL response dicts.
+        :return: Name of the DuckDB table holding the combined records.
         """
-        hash_input = "|".join(sorted(json_paths)).encode()
-        file_hash = hashlib.md5(hash_input).hexdigest()
-        return f"output_{file_hash}.{self.output_format}"
+        if self.output_format != "duckdb":
+            raise ValueError("convert_responses only supports the duckdb output format.")
+
+        combined_records = []
+        for i, data in enumerate(responses):
+            if data is None:
+                logger.warning("Skipping missing response #%d", i)
+                continue
+            combined_records.extend(self._flatten_payload(data, f"response #{i}"))
+
+        return self._store_duckdb(combined_records)
 
     def convert(self, json_paths):
         """
@@ -82,52 +274,64 @@ class JSONToTabular:
         :param json_paths: List of paths to JSON files containing GraphQL responses.
         :return: Path of the saved combined tabular file.
         """
-        
+
         if not json_paths:
             raise ValueError("No input JSON files provided.")
-        
-        combined_records = []
-        valid_paths = []
 
+        valid_paths = []
         for json_path in json_paths:
             if not json_path or not os.path.exists(json_path):
                 print(f"⚠️ Skipping missing file: {json_path}")
                 continue
-            
             valid_paths.append(json_path)
 
-            with open(json_path, "r") as file:
-                data = json.load(file)
+        if self.output_format == "duckdb":
+            combined_records = []
+            for records in self._iter_file_records(valid_paths):
+                combined_records.extend(records)
+            return self._store_duckdb(combined_records)
+
+        output_filename = self._generate_output_filename(valid_paths)
+        output_path = os.path.join(self.output_dir, output_filename)
 
-            if "data" not in data:
-                raise ValueError(f"Invalid GraphQL response format in {json_path}: 'data' field missing.")
+        if self.output_format == "jsonl":
+            # Stream rows out as each file is flattened: peak memory stays at
+            # one file's rows instead of the whole batch, and the buffered
+            # binary writer amortizes the write syscalls.
+            dumps = orjson.dumps if orjson is not None else (
+                lambda row: json.dumps(row, separators=(",", ":")).encode("utf-8")
+            )
+            with open(output_path, "wb") as f:
+                for records in self._iter_file_records(valid_paths):
+                    f.write(b"".join(dumps(row) + b"\n" for row in records))
+            return output_path
 
-            for key, value in data["data"].items():
-                flattened_data = self.flatten_json(value, parent_key=key)
-                combined_records.extend(flattened_data)
-                    
-        df = pd.DataFrame(combined_records)
+        combined_records = []
+        for records in self._iter_file_records(valid_paths):
+            combined_records.extend(records)
 
-        if df.empty:
-            df = pd.DataFrame([{}]) 
+        if self.output_format == "parquet":
+            # Arrow writes the columnar data straight out — no pandas
+            # round-trip and no dtype inference in between.
+            import pyarrow.parquet as pq
 
-        output_filename = self._generate_output_filename(valid_paths)
-        output_path = os.path.join(self.output_dir, output_filename)
+            table = pa.table(self._columnize(combined_records))
+            pq.write_table(table, output_path, compression="snappy")
+            return output_path
 
         if self.output_format == "csv":
-            df.to_csv(output_path, index=False)
-        elif self.output_format == "parquet":
-            df.to_parquet(output_path, index=False)
-        elif self.output_format == "jsonl":
-            df.to_json(output_path, orient="records", lines=True)
-        elif self.output_format == "duckdb":
-            con = DuckDBSingleton.get_connection()
-            con.execute(f"DROP TABLE IF EXISTS {self.table_name}")
-            con.execute(f"CREATE TABLE {self.table_name} AS SELECT * FROM df")
-            print(f"✅ Data stored in DuckDB's `{self.table_name}`")
-            return self.table_name
-        else:
-            raise ValueError("Unsupported output format.")
+            # Arrow's CSV writer formats and quotes in multithreaded C++;
+            # pandas serialized every cell through Python.
+            import pyarrow.csv as pacsv
+
+            columns = self._columnize(combined_records)
+            if columns:
+                pacsv.write_csv(pa.table(columns), output_path)
+            else:
+                # Match the old empty-frame output: a header-less blank row.
+                with open(output_path, "w") as f:
+                    f.write("\n\n")
+            return output_path
 
-        return output_path
+        raise ValueError("Unsupported output format.")
         
\ No newline at end of file
@@ -6,10 +6,15 @@ from sqlparse.tokens import DML, Keyword, Wildcard, Whitespace, Punctuation
 
 AGGREGATION_FUNCTIONS = {"COUNT", "COUNT_DISTINCT", "SUM", "AVG", "MIN", "MAX"}
 class SQLParser:
-    def __init__(self, mappings_path="schemas/mappings.json", relations_path="schemas/relations.json"):
-        """Initialize SQL to GraphQL converter with mappings & relations JSON files."""
-        self.mappings = self._load_json(mappings_path)
-        self.relations = self._load_json(relations_path)
+    def __init__(self, mappings_path="schemas/mappings.json", relations_path="schemas/relations.json",
+                 mappings=None, relations=None):
+        """
+        Initialize SQL to GraphQL converter with mappings & relations JSON files.
+        Pre-parsed `mappings`/`relations` dicts may be passed instead to skip
+        re-reading the files.
+        """
+        self.mappings = mappings if mappings is not None else self._load_json(mappings_path)
+        self.relations = relations if relations is not None else self._load_json(relations_path)
 
     def _load_json(self, path):
         """Loads JSON data from a file."""
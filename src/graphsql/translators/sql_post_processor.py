@@ -1,26 +1,50 @@
 from graphsql.dbapi.duckdb import DuckDBSingleton
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+_VALID_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def _sanitize_ident(name):
+    """
+    Validates a DuckDB table identifier. The default table name is derived
+    from untrusted statement text (subquery alias / table), so reject
+    anything that is not a plain identifier before it is interpolated into
+    the final query.
+    """
+    if not _VALID_IDENT.fullmatch(name):
+        raise ValueError(f"Invalid table identifier: {name!r}")
+    return name
+
+
 class SQLPostProcessor:
     """
     Applies remaining SQL filters (ORDER BY, GROUP BY, aggregations) on the DuckDB virtual_table.
     """
 
-    def __init__(self, parsed_data):
+    def __init__(self, parsed_data, table_name=None):
         """
         Initializes the post-processor with filters extracted from SQLParser.
 
         Args:
             filters (dict): Remaining SQL filters (group_by, aggregations, order_by, limit, etc.).
+            table_name (str, optional): DuckDB table holding the ingested
+                data; defaults to the name derived from the parsed statement.
         """
         self.parsed_data = parsed_data
         self.filters = parsed_data.get("filters", {})
-        self.table_name = (
-            parsed_data.get("subquery_alias")
+        self.table_name = _sanitize_ident(
+            table_name
+            or parsed_data.get("subquery_alias")
             or parsed_data.get("table")
             or "virtual_table"
         )
-        self.con = DuckDBSingleton.get_connection()
+        # A per-instance cursor (and the post-processor is per-statement), so
+        # parallel executes run concurrently instead of serializing on the
+        # shared connection's internal mutex.
+        self.con = DuckDBSingleton.get_cursor()
 
     def construct_query(self):
         """Constructs the final SQL query dynamically based on the filters."""
@@ -117,15 +141,19 @@ class SQLPostProcessor:
 
         final_query = f"SELECT {', '.join(select_clauses)} FROM {self.table_name} {group_by_clause} {order_by_clause} {limit_clause}"
 
-        print("\nPost Processing Query: ", final_query.strip())
+        logger.debug("Post processing query: %s", final_query.strip())
         return final_query.strip()
 
     def execute(self):
-        """Executes the constructed SQL query on DuckDB and returns results."""
-        
-        print("\nPost Processing Data: ", self.parsed_data)
-        
+        """
+        Executes the constructed SQL query on DuckDB and returns the result
+        as a pyarrow.Table. The columnar form crosses from DuckDB without
+        per-cell Python objects, and Arrow's validity bitmap means SQL NULLs
+        surface as plain None when rows are synthesized — not the masked
+        sentinels numpy masked arrays would inject.
+        """
+
+        logger.debug("Post processing data: %s", self.parsed_data)
+
         final_query = self.construct_query()
-        df = self.con.execute(final_query).fetchdf()
-        
-        return df
\ No newline at end of file
+        return self.con.execute(final_query).fetch_arrow_table()
\ No newline at end of file
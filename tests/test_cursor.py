@@ -4,7 +4,7 @@ from graphsql.dbapi.connection import GraphSQLConnection
 
 endpoint = "https://graphql.anilist.co"
 sql_query = "SELECT media.id, media.title.english FROM Page"
-hash = "c0ca28bd42"
+hash = "82644f6cf7"
 
 def test_graphsql_cursor():
     """Test if GraphSQLCursor can execute queries and fetch results."""